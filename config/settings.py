@@ -23,6 +23,10 @@ class Config:
         self.max_spec: int = 360
         self.change_num: int = 50
         self.full_progress: int = 100
+        self.memory_budget_mb: int = 2048  # RAM shared by all concurrent renders
+        self.max_workers: int = 0  # Workers shared by all concurrent renders, 0 uses every core
+        self.source_cache_dir: str = ""  # Decoded source cache, empty disables it
+        self.source_cache_max_mb: int = 4096
         self.font_path: str = "assets/Akrobat-Bold.otf"  # Relative path, adjustable
         self.check_add_text_box: bool = False
         self.bg_color: str = "white"
@@ -45,6 +49,12 @@ class Config:
             raise ConfigError("max_spec must be between 0 and 360")
         if self.change_num <= 0:
             raise ConfigError("change_num must be positive")
+        if self.memory_budget_mb <= 0:
+            raise ConfigError("memory_budget_mb must be positive")
+        if self.max_workers < 0:
+            raise ConfigError("max_workers must not be negative")
+        if self.source_cache_max_mb <= 0:
+            raise ConfigError("source_cache_max_mb must be positive")
         if not self.slogans:
             raise ConfigError("At least one slogan is required")
 
@@ -63,6 +73,10 @@ class Config:
             "max_spec": self.max_spec,
             "change_num": self.change_num,
             "full_progress": self.full_progress,
+            "memory_budget_mb": self.memory_budget_mb,
+            "max_workers": self.max_workers,
+            "source_cache_dir": self.source_cache_dir,
+            "source_cache_max_mb": self.source_cache_max_mb,
             "font_path": self.font_path,
             "check_add_text_box": self.check_add_text_box,
             "bg_color": self.bg_color,
@@ -1,6 +1,12 @@
 import numpy as np
 from PIL import Image
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from threading import Thread
+from .render_scheduler import DEFAULT_STAGES
+from .source_cache import CachedSource
+
+# Cached sources are already split into HSV planes.
+CACHED_STAGES = tuple(stage for stage in DEFAULT_STAGES if stage not in ("hsv_convert", "split"))
 
 
 class HueChanger(Thread):
@@ -30,6 +36,16 @@ class HueChanger(Thread):
     :ivar text_adder: Optional dependency to add text to images, can be injected
                       through a method call.
     :type text_adder: Any
+    :ivar scheduler: Optional RenderScheduler deciding how many variants run
+                     at once and whether they are tiled, can be injected
+                     through a method call.
+    :type scheduler: Any
+    :ivar plan: Plan the scheduler chose for the last run, None when unscheduled.
+    :type plan: Optional[RenderPlan]
+    :ivar source_cache: Optional DecodedSourceCache providing memory-mapped
+                        HSV planes of the source instead of decoding it,
+                        can be injected through a method call.
+    :type source_cache: Any
     """
     def __init__(self, image_path, output_folder, progress_callback, done_callback, config, file_namer):
         super().__init__()
@@ -40,13 +56,23 @@ class HueChanger(Thread):
         self.config = config
         self.file_namer = file_namer
         self.text_adder = None  # To be injected if needed
+        self.scheduler = None  # To be injected if needed
+        self.plan = None
+        self.source_cache = None  # To be injected if needed
 
     def set_text_adder(self, text_adder):
         """Inject text adder dependency."""
         self.text_adder = text_adder
 
+    def set_scheduler(self, scheduler):
+        """Inject render scheduler dependency."""
+        self.scheduler = scheduler
+
+    def set_source_cache(self, source_cache):
+        """Inject decoded source cache dependency."""
+        self.source_cache = source_cache
+
     def run(self):
-        original_image = Image.open(self.image_path)
         hue_shifts = np.linspace(
             self.config.zero_spec,
             self.config.max_spec,
@@ -54,27 +80,89 @@ class HueChanger(Thread):
             dtype=int
         )
 
-        for idx, hue_shift in enumerate(hue_shifts):
-            variant_image = self._change_hue(original_image, hue_shift)
-            file_name = self.file_namer.generate_file_name(idx)
-            output_path = f"{self.output_folder}/{file_name}"
-
-            if self.text_adder and self.config.check_add_text_box:
-                variant_image = self.text_adder.add_text(
-                    variant_image,
-                    self.config.slogans[idx % len(self.config.slogans)]
-                )
-            variant_image.save(output_path)
-            self.progress_callback(idx)
+        if self.scheduler is None:
+            original_image = self._load_source()
+            for idx, hue_shift in enumerate(hue_shifts):
+                self._render_variant(original_image, idx, hue_shift)
+                self.progress_callback(idx)
+        else:
+            self._run_scheduled(hue_shifts)
 
         self.done_callback()
 
+    def _run_scheduled(self, hue_shifts):
+        """Render variants concurrently within the scheduler's memory budget."""
+        with Image.open(self.image_path) as header:
+            size, mode = header.size, header.mode  # Read from the header, no decode
+
+        stages = CACHED_STAGES if self.source_cache else DEFAULT_STAGES
+        with self.scheduler.schedule(size, mode, len(hue_shifts), stages) as plan:
+            self.plan = plan
+            original_image = self._load_source()
+            if isinstance(original_image, Image.Image):
+                original_image.load()  # Decode once before workers share it
+            with ThreadPoolExecutor(max_workers=plan.workers) as executor:
+                futures = [
+                    executor.submit(self._render_variant, original_image, idx, hue_shift, plan.tile_rows)
+                    for idx, hue_shift in enumerate(hue_shifts)
+                ]
+                try:
+                    for done, future in enumerate(as_completed(futures)):
+                        future.result()
+                        self.progress_callback(done)
+                except Exception:
+                    # Drop queued variants so the reservation is released promptly
+                    executor.shutdown(cancel_futures=True)
+                    raise
+
+    def _load_source(self):
+        """Return the source as cached HSV planes if a cache is set, else as a PIL image."""
+        if self.source_cache:
+            return self.source_cache.load(self.image_path, planes=("hsv",))
+        return Image.open(self.image_path)
+
+    def _render_variant(self, original_image, idx, hue_shift, tile_rows=None):
+        if tile_rows:
+            variant_image = self._change_hue_tiled(original_image, hue_shift, tile_rows)
+        else:
+            variant_image = self._change_hue(original_image, hue_shift)
+        file_name = self.file_namer.generate_file_name(idx)
+        output_path = f"{self.output_folder}/{file_name}"
+
+        if self.text_adder and self.config.check_add_text_box:
+            variant_image = self.text_adder.add_text(
+                variant_image,
+                self.config.slogans[idx % len(self.config.slogans)]
+            )
+        variant_image.save(output_path)
+
     @staticmethod
     def _change_hue(image, hue_shift):
         """Shift the hue of an image by a specified amount."""
+        if isinstance(image, CachedSource):
+            return HueChanger._change_hue_planes(image.hsv, hue_shift)
         hsv_image = image.convert("HSV")
         h, s, v = hsv_image.split()
         np_h = (np.array(h) + hue_shift) % 256
         h_shifted = Image.fromarray(np_h.astype("uint8"))
         hsv_shifted_image = Image.merge("HSV", (h_shifted, s, v))
-        return hsv_shifted_image.convert("RGB")
\ No newline at end of file
+        return hsv_shifted_image.convert("RGB")
+
+    @staticmethod
+    def _change_hue_planes(hsv_planes, hue_shift):
+        """Shift the hue of (3, height, width) HSV planes without copying S and V."""
+        h, s, v = hsv_planes
+        np_h = h + np.uint8(hue_shift % 256)  # uint8 addition wraps like % 256
+        h_shifted = Image.fromarray(np_h)
+        hsv_shifted_image = Image.merge("HSV", (h_shifted, Image.fromarray(s), Image.fromarray(v)))
+        return hsv_shifted_image.convert("RGB")
+
+    @staticmethod
+    def _change_hue_tiled(image, hue_shift, tile_rows):
+        """Shift the hue of an image strip by strip to bound peak memory."""
+        width, height = image.size
+        output = Image.new("RGB", image.size)
+        for top in range(0, height, tile_rows):
+            strip = image.crop((0, top, width, min(height, top + tile_rows)))
+            output.paste(HueChanger._change_hue(strip, hue_shift), (0, top))
+        return output
@@ -0,0 +1,213 @@
+import logging
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Bytes per band for the PIL modes a master can realistically arrive in.
+_MODE_BYTES_PER_BAND = {
+    "I": 4,
+    "F": 4,
+    "I;16": 2,
+    "I;16B": 2,
+    "I;16L": 2,
+}
+
+# Transient bytes per pixel allocated by each stage of a single variant.
+# The numbers follow HueChanger._change_hue: the HSV copy, the three split
+# planes, the int64 hue arithmetic plus its uint8 result, the merged HSV
+# image and the final RGB image.
+STAGE_BYTES_PER_PIXEL = {
+    "hsv_convert": 3,
+    "split": 3,
+    "hue_shift": 10,
+    "merge": 3,
+    "rgb_convert": 3,
+}
+
+DEFAULT_STAGES = tuple(STAGE_BYTES_PER_PIXEL)
+
+
+class RenderPlan:
+    """
+    Decision taken by the scheduler for a single render job.
+
+    :ivar size: Width and height of the source image.
+    :type size: Tuple[int, int]
+    :ivar variant_count: Number of variants the job will produce.
+    :type variant_count: int
+    :ivar workers: Number of variants rendered concurrently.
+    :type workers: int
+    :ivar tile_rows: Height of the strips each variant is processed in,
+                     or None when variants are processed in one piece.
+    :type tile_rows: Optional[int]
+    :ivar shared_bytes: Estimated bytes held once per job (decoded source).
+    :type shared_bytes: int
+    :ivar variant_bytes: Estimated peak bytes of one in-flight variant.
+    :type variant_bytes: int
+    :ivar budget_bytes: Budget that was available when the plan was made.
+    :type budget_bytes: int
+    """
+    def __init__(self, size, variant_count, workers, tile_rows, shared_bytes, variant_bytes, budget_bytes):
+        self.size = size
+        self.variant_count = variant_count
+        self.workers = workers
+        self.tile_rows = tile_rows
+        self.shared_bytes = shared_bytes
+        self.variant_bytes = variant_bytes
+        self.budget_bytes = budget_bytes
+
+    @property
+    def reserved_bytes(self):
+        return self.shared_bytes + self.workers * self.variant_bytes
+
+    def describe(self):
+        """Return a one-line, human-readable summary of the plan."""
+        width, height = self.size
+        tiling = f"tiles of {self.tile_rows} rows" if self.tile_rows else "no tiling"
+        return (
+            f"{width}x{height}, {self.variant_count} variants: {self.workers} worker(s), {tiling}, "
+            f"reserving {self.reserved_bytes / 2**20:.1f} MiB of {self.budget_bytes / 2**20:.1f} MiB available"
+        )
+
+
+class RenderScheduler:
+    """
+    Shares a RAM budget between concurrently running render jobs.
+
+    Each job asks the scheduler for a plan before it decodes its source. The
+    plan is sized from the image dimensions, mode and pipeline stages so that
+    the memory reserved by all active jobs stays under the configured budget,
+    while the workers of all active jobs together use as many cores as
+    ``max_workers`` allows. When a single full-frame variant does not fit, the
+    plan switches to tiling. A job waits while other jobs hold the memory or
+    the workers it needs.
+
+    A single instance is meant to be shared by every HueChanger thread.
+
+    :ivar config: Configuration object providing ``memory_budget_mb`` and
+                  ``max_workers``.
+    :type config: Config
+    :ivar history: Most recent plans, newest last, for tuning the budget.
+    :type history: collections.deque
+    """
+    MIN_TILE_ROWS = 16
+    HISTORY_SIZE = 50
+
+    def __init__(self, config):
+        self.config = config
+        self.history = deque(maxlen=self.HISTORY_SIZE)
+        self._reserved = 0
+        self._reserved_workers = 0
+        self._active_jobs = 0
+        self._condition = threading.Condition()
+
+    @property
+    def budget_bytes(self):
+        return int(self.config.memory_budget_mb) * 2**20
+
+    @property
+    def max_workers(self):
+        return self.config.max_workers or os.cpu_count() or 1
+
+    @staticmethod
+    def estimate_source_bytes(size, mode):
+        """Estimate the bytes of a decoded image of the given size and mode."""
+        width, height = size
+        if mode in _MODE_BYTES_PER_BAND:
+            return width * height * _MODE_BYTES_PER_BAND[mode]
+        # PIL stores every multi-band 8-bit mode in 4 bytes per pixel.
+        bands = 1 if mode in ("1", "L", "P") else 4
+        return width * height * bands
+
+    @staticmethod
+    def estimate_variant_bytes(size, stages=DEFAULT_STAGES, tile_rows=None):
+        """Estimate the peak bytes of one variant going through ``stages``."""
+        width, height = size
+        per_pixel = sum(STAGE_BYTES_PER_PIXEL[stage] for stage in stages)
+        if not tile_rows:
+            return width * height * per_pixel
+        # Tiled variants keep a full-frame RGB output and process one strip at a time.
+        return width * height * 3 + width * min(tile_rows, height) * per_pixel
+
+    def plan(self, size, mode, variant_count, stages=DEFAULT_STAGES, available=None, worker_limit=None):
+        """
+        Build a plan for a job without reserving anything.
+
+        :param size: Width and height of the source image.
+        :param mode: PIL mode of the source image.
+        :param variant_count: Number of variants the job will produce.
+        :param stages: Pipeline stages each variant goes through.
+        :param available: Bytes available to this job, defaults to the whole budget.
+        :param worker_limit: Workers available to this job, defaults to ``max_workers``.
+        :return: The resulting plan.
+        :rtype: RenderPlan
+        """
+        available = self.budget_bytes if available is None else available
+        width, height = size
+        shared = self.estimate_source_bytes(size, mode)
+        worker_limit = self.max_workers if worker_limit is None else worker_limit
+        worker_cap = max(1, min(worker_limit, variant_count))
+
+        variant = self.estimate_variant_bytes(size, stages)
+        tile_rows = None
+        if shared + variant > available:
+            per_pixel = sum(STAGE_BYTES_PER_PIXEL[stage] for stage in stages)
+            room = available - shared - width * height * 3
+            tile_rows = max(self.MIN_TILE_ROWS, room // max(1, width * per_pixel))
+            tile_rows = min(int(tile_rows), height)
+            variant = self.estimate_variant_bytes(size, stages, tile_rows)
+
+        workers = max(1, min(worker_cap, (available - shared) // max(1, variant)))
+        return RenderPlan(size, variant_count, int(workers), tile_rows, shared, variant, available)
+
+    def acquire(self, size, mode, variant_count, stages=DEFAULT_STAGES):
+        """
+        Wait for enough budget and a free worker, then reserve them for a job.
+
+        A job that cannot fit even with tiling and a single worker is let
+        through once no other job is running, so it is never starved.
+
+        :return: The plan the job must follow; pass it to ``release`` when done.
+        :rtype: RenderPlan
+        """
+        with self._condition:
+            waiting = False
+            while True:
+                available = self.budget_bytes - self._reserved
+                free_workers = self.max_workers - self._reserved_workers
+                plan = self.plan(size, mode, variant_count, stages, available, max(1, free_workers))
+                if self._active_jobs == 0 or (plan.reserved_bytes <= available and free_workers >= 1):
+                    break
+                if not waiting:
+                    logger.info(f"Waiting for memory budget or a free worker: {plan.describe()}")
+                    waiting = True
+                self._condition.wait()
+
+            if plan.reserved_bytes > available:
+                logger.warning(f"Job exceeds memory budget even when tiled: {plan.describe()}")
+            self._reserved += plan.reserved_bytes
+            self._reserved_workers += plan.workers
+            self._active_jobs += 1
+            self.history.append(plan)
+            logger.info(f"Scheduled render: {plan.describe()}")
+            return plan
+
+    def release(self, plan):
+        """Return the budget and workers reserved by ``plan`` and wake waiting jobs."""
+        with self._condition:
+            self._reserved -= plan.reserved_bytes
+            self._reserved_workers -= plan.workers
+            self._active_jobs -= 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def schedule(self, size, mode, variant_count, stages=DEFAULT_STAGES):
+        """Context manager pairing ``acquire`` and ``release``."""
+        plan = self.acquire(size, mode, variant_count, stages)
+        try:
+            yield plan
+        finally:
+            self.release(plan)
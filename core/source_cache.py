@@ -0,0 +1,192 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+class CachedSource:
+    """
+    Decoded planes of a source image, usually memory-mapped from the cache.
+
+    Exposes ``size`` and ``crop`` like a PIL image so it can be tiled the
+    same way.
+
+    :ivar rgb: RGB pixels shaped (height, width, 3), or None if not loaded.
+    :type rgb: Optional[numpy.ndarray]
+    :ivar hsv: HSV planes shaped (3, height, width), or None if not loaded.
+    :type hsv: Optional[numpy.ndarray]
+    """
+    def __init__(self, rgb=None, hsv=None):
+        self.rgb = rgb
+        self.hsv = hsv
+
+    @property
+    def size(self):
+        if self.hsv is not None:
+            return self.hsv.shape[2], self.hsv.shape[1]
+        return self.rgb.shape[1], self.rgb.shape[0]
+
+    def crop(self, box):
+        """Return a view of the region ``(left, top, right, bottom)``."""
+        left, top, right, bottom = box
+        rgb = None if self.rgb is None else self.rgb[top:bottom, left:right]
+        hsv = None if self.hsv is None else self.hsv[:, top:bottom, left:right]
+        return CachedSource(rgb, hsv)
+
+
+class DecodedSourceCache:
+    """
+    On-disk cache of decoded source planes stored as memory-mappable arrays.
+
+    Every plane is saved as a ``.npy`` file keyed by the source's absolute
+    path, modification time, file size and content hash, so later runs and
+    parallel workers map the pixels instead of decoding the master again.
+    The least recently used entries are evicted once the cache grows past
+    ``max_bytes``.
+
+    :ivar cache_dir: Directory holding the cached planes.
+    :type cache_dir: Path
+    :ivar max_bytes: Size cap of the cache directory in bytes.
+    :type max_bytes: int
+    """
+    PLANES = ("rgb", "hsv")
+    HASH_CHUNK_SIZE = 2**20
+    STALE_TMP_SECONDS = 3600  # Partial writes older than this were left by a crashed worker
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._digests = {}  # (path, mtime_ns, size) -> content digest
+        self._lock = threading.Lock()
+
+    def load(self, image_path, planes=PLANES):
+        """
+        Return the requested planes of ``image_path``, decoding only on a miss.
+
+        Falls back to in-memory planes if the cache cannot be read or written.
+
+        :param image_path: Path to the source image.
+        :param planes: Names of the planes to load, any of ``"rgb"`` and ``"hsv"``.
+        :rtype: CachedSource
+        """
+        unknown = set(planes) - set(self.PLANES)
+        if unknown:
+            raise ValueError(f"Unknown planes: {sorted(unknown)}")
+
+        try:
+            key = self._key(image_path)
+            paths = {plane: self.cache_dir / f"{key}.{plane}.npy" for plane in planes}
+            if all(path.is_file() for path in paths.values()):
+                try:
+                    cached = CachedSource(**{plane: np.load(path, mmap_mode="r") for plane, path in paths.items()})
+                except (ValueError, EOFError) as e:
+                    logger.warning(f"Corrupt source cache entry for {image_path}: {str(e)}. Decoding again.")
+                    for path in paths.values():
+                        path.unlink(missing_ok=True)
+                else:
+                    logger.debug(f"Source cache hit for {image_path}")
+                    for path in paths.values():
+                        os.utime(path)  # Mark as recently used
+                    return cached
+        except OSError as e:
+            logger.warning(f"Source cache unavailable for {image_path}: {str(e)}. Decoding in memory.")
+            return CachedSource(**self._decode(image_path, planes))
+
+        logger.debug(f"Source cache miss for {image_path}")
+        decoded = self._decode(image_path, planes)
+        entry_bytes = sum(array.nbytes for array in decoded.values())
+        if entry_bytes > self.max_bytes:
+            logger.warning(f"Decoded {image_path} exceeds the source cache cap. Not caching.")
+            return CachedSource(**decoded)
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for plane, array in decoded.items():
+                self._write(paths[plane], array)
+            self._evict(keep=set(paths.values()))
+            return CachedSource(**{plane: np.load(path, mmap_mode="r") for plane, path in paths.items()})
+        except (OSError, ValueError, EOFError) as e:
+            logger.warning(f"Failed to cache {image_path}: {str(e)}. Using in-memory planes.")
+            return CachedSource(**decoded)
+
+    def clear(self):
+        """Remove every cached plane and partial write."""
+        for path in [*self.cache_dir.glob("*.npy"), *self.cache_dir.glob("*.tmp")]:
+            try:
+                path.unlink()
+            except OSError as e:
+                logger.warning(f"Failed to remove {path}: {str(e)}")
+
+    def _key(self, image_path):
+        path = os.path.abspath(image_path)
+        stat = os.stat(path)
+        stat_key = (path, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            digest = self._digests.get(stat_key)
+        if digest is None:
+            hasher = hashlib.blake2b(digest_size=16)
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(self.HASH_CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+            with self._lock:
+                self._digests[stat_key] = digest
+        return hashlib.blake2b(f"{path}|{stat.st_mtime_ns}|{stat.st_size}|{digest}".encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _decode(image_path, planes):
+        with Image.open(image_path) as image:
+            rgb_image = image.convert("RGB")
+        decoded = {}
+        if "rgb" in planes:
+            decoded["rgb"] = np.asarray(rgb_image)
+        if "hsv" in planes:
+            # Plane-major layout keeps each channel contiguous for zero-copy views.
+            decoded["hsv"] = np.ascontiguousarray(np.asarray(rgb_image.convert("HSV")).transpose(2, 0, 1))
+        return decoded
+
+    def _write(self, path, array):
+        """Write ``array`` atomically so concurrent readers never see a partial file."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, array)
+            os.replace(tmp_path, path)
+        except OSError:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def _evict(self, keep):
+        entries = []
+        stale_before = time.time() - self.STALE_TMP_SECONDS
+        for path in [*self.cache_dir.glob("*.npy"), *self.cache_dir.glob("*.tmp")]:
+            try:
+                stat = path.stat()
+                if path.suffix == ".tmp" and stat.st_mtime < stale_before:
+                    path.unlink()
+                    logger.debug(f"Removed stale partial write {path.name} from source cache")
+                    continue
+            except OSError:
+                continue  # Removed by another worker
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            if path in keep or path.suffix == ".tmp":
+                continue  # Fresh partial writes belong to workers still running
+            try:
+                path.unlink()
+                total -= size
+                logger.debug(f"Evicted {path.name} from source cache")
+            except OSError as e:
+                logger.warning(f"Failed to evict {path}: {str(e)}")
@@ -9,6 +9,8 @@ from .widgets import WidgetManager
 from core.hue_changer import HueChanger
 from core.text_adder import TextAdder
 from core.file_namer import FileNamer
+from core.render_scheduler import RenderScheduler
+from core.source_cache import DecodedSourceCache
 from config.settings import ConfigFactory
 
 
@@ -32,6 +34,10 @@ class App(tk.Tk):
     :type ok_clicked: bool
     :ivar hue_changer: Reference to the HueChanger thread that applies hue variations.
     :type hue_changer: Optional[HueChanger]
+    :ivar render_scheduler: Scheduler sharing the memory budget between renders.
+    :type render_scheduler: RenderScheduler
+    :ivar source_cache: Cache of decoded sources, None if disabled in the config.
+    :type source_cache: Optional[DecodedSourceCache]
     :ivar widget_manager: Manages the creation and interaction of UI widgets.
     :type widget_manager: WidgetManager
     """
@@ -43,6 +49,10 @@ class App(tk.Tk):
         self.folder_path = None
         self.ok_clicked = False
         self.hue_changer = None  # Track the HueChanger thread
+        self.render_scheduler = RenderScheduler(config)
+        self.source_cache = None
+        if config.source_cache_dir:
+            self.source_cache = DecodedSourceCache(config.source_cache_dir, config.source_cache_max_mb * 2**20)
         self._setup_window()
         self.widget_manager = WidgetManager(self, config)
         self.widget_manager.setup_widgets()
@@ -133,6 +143,9 @@ class App(tk.Tk):
                 self.file_namer
             )
             self.hue_changer.set_text_adder(TextAdder(self.config))
+            self.hue_changer.set_scheduler(self.render_scheduler)
+            if self.source_cache:
+                self.hue_changer.set_source_cache(self.source_cache)
             self.hue_changer.start()
             self.widget_manager.start_button["state"] = tk.DISABLED
 
@@ -142,6 +155,8 @@ class App(tk.Tk):
     def _done(self):
         self.widget_manager.progress["value"] = self.config.full_progress
         self.widget_manager.label["text"] = "Variants created with different hues."
+        if self.hue_changer.plan:
+            self.widget_manager.label["text"] += f"\n{self.hue_changer.plan.describe()}"
         self.widget_manager.start_button["state"] = tk.NORMAL
         folder_directory = os.path.abspath(self.folder_path)
         target_base_to_open = Path(self.file_namer.generate_file_name(0)).stem + ".jpg"